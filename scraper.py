@@ -5,16 +5,46 @@ Computes beach & airport distances from coordinates.
 Budget: 150,000 CAD ≈ €102,000 EUR.
 """
 
+import asyncio
+import contextlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from curl_cffi import requests as cffi_req
-from bs4 import BeautifulSoup
 import json
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used as a fallback
+    orjson = None
 import re
+import sys
 import time
 import os
-import math
+import numpy as np
+import functools
+import gzip
+import shutil
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from dataclasses import asdict, dataclass, field, is_dataclass
 from datetime import datetime
-from urllib.parse import urljoin
+from operator import attrgetter
+from types import MappingProxyType
+
+# orjson decodes/encodes several times faster; both paths yield the same data
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False)
 
 # ── Greek airports with coordinates ────────────────────────────────
 AIRPORTS = {
@@ -49,23 +79,46 @@ AIRPORTS = {
 }
 
 # ── Beach data from OpenStreetMap (loaded at runtime) ──────────────
-_BEACHES_CACHE = None
 
+_BEACH_JSON = os.path.join(os.path.dirname(__file__), "data", "greek_beaches.json")
+# Column copy of the JSON (lat / lng / name arrays), rebuilt when stale
+_BEACH_NPZ = os.path.join(os.path.dirname(__file__), "data", "greek_beaches.npz")
+
+
+@functools.cache
 def _load_beaches():
-    """Load 7000+ real beach coordinates from OSM Overpass data."""
-    global _BEACHES_CACHE
-    if _BEACHES_CACHE is not None:
-        return _BEACHES_CACHE
-
-    beach_file = os.path.join(os.path.dirname(__file__), "data", "greek_beaches.json")
-    if os.path.exists(beach_file):
-        with open(beach_file, "r", encoding="utf-8") as f:
-            _BEACHES_CACHE = json.load(f)
-        print(f"    Loaded {len(_BEACHES_CACHE)} real beaches from OSM data")
+    """Load 7000+ real beach coordinates from OSM Overpass data as parallel
+    (lat, lng, name) numpy arrays. Cached for the life of the process;
+    callers must not mutate the arrays.
+    """
+    if (os.path.exists(_BEACH_NPZ) and
+            (not os.path.exists(_BEACH_JSON) or
+             os.path.getmtime(_BEACH_NPZ) >= os.path.getmtime(_BEACH_JSON))):
+        with np.load(_BEACH_NPZ) as z:
+            lat, lng, name = z["lat"], z["lng"], z["name"]
     else:
-        print("    WARNING: data/greek_beaches.json not found, fetching from Overpass API...")
-        _BEACHES_CACHE = _fetch_beaches_from_overpass()
-    return _BEACHES_CACHE
+        if os.path.exists(_BEACH_JSON):
+            with open(_BEACH_JSON, "rb") as f:
+                beaches = _json_loads(f.read())
+        else:
+            print("    WARNING: data/greek_beaches.json not found, fetching from Overpass API...")
+            beaches = _fetch_beaches_from_overpass()
+        lat = np.array([b["lat"] for b in beaches], dtype=float)
+        lng = np.array([b["lng"] for b in beaches], dtype=float)
+        name = np.array([b.get("name", "") for b in beaches], dtype=str)
+        # Overpass can return one beach as both a node and a way; keep the
+        # first row per coordinate so repeats don't crowd the top-k candidates.
+        _, first = np.unique(np.column_stack((lat, lng)), axis=0, return_index=True)
+        if len(first) < len(lat):
+            keep = np.sort(first)
+            print(f"    Dropped {len(lat) - len(keep)} duplicate beach coordinates")
+            lat, lng, name = lat[keep], lng[keep], name[keep]
+        try:
+            np.savez(_BEACH_NPZ, lat=lat, lng=lng, name=name)
+        except Exception:
+            pass  # read-only checkout: just decode the JSON again next run
+    print(f"    Loaded {len(lat)} real beaches from OSM data")
+    return lat, lng, name
 
 
 def _fetch_beaches_from_overpass():
@@ -81,9 +134,9 @@ def _fetch_beaches_from_overpass():
     );
     out center;
     """
-    r = requests.post("https://overpass-api.de/api/interpreter",
-                      data={"data": query}, timeout=90)
-    data = r.json()
+    r = _http().post("https://overpass-api.de/api/interpreter",
+                     data={"data": query}, timeout=90)
+    data = _json_loads(r.content)
     beaches = []
     for el in data.get("elements", []):
         lat = el.get("lat") or el.get("center", {}).get("lat")
@@ -92,9 +145,9 @@ def _fetch_beaches_from_overpass():
         if lat and lng:
             beaches.append({"lat": lat, "lng": lng, "name": name})
 
-    os.makedirs("data", exist_ok=True)
-    with open(os.path.join("data", "greek_beaches.json"), "w", encoding="utf-8") as f:
-        json.dump(beaches, f, ensure_ascii=False)
+    os.makedirs(os.path.dirname(_BEACH_JSON), exist_ok=True)
+    with open(_BEACH_JSON, "w", encoding="utf-8") as f:
+        f.write(_json_dumps(beaches))
     print(f"    Fetched and cached {len(beaches)} beaches from Overpass API")
     return beaches
 
@@ -130,163 +183,438 @@ CITIES = [
     {"name": "Preveza", "lat": 38.9509, "lng": 20.7531, "pop": 32000},
 ]
 
+# ── On-disk result cache (shared across runs) ───────────────────────
+_CACHE_PATH = os.path.join(os.path.dirname(__file__), "data", "http_cache.sqlite")
+_CACHE_LOCK = threading.Lock()
+OSRM_CACHE_MAX_AGE = 30 * 86400  # road distances rarely change
+OSRM_RATE = 4  # requests/second to the public OSRM demo server
+
+
+@functools.cache
+def _cache_db():
+    os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+    db = sqlite3.connect(_CACHE_PATH, check_same_thread=False)
+    db.execute("CREATE TABLE IF NOT EXISTS cache ("
+               "ns TEXT, key TEXT, value TEXT, ts REAL, PRIMARY KEY (ns, key))")
+    return db
+
+
+def _cache_get(ns, key, max_age_s):
+    """Return the cached JSON value for (ns, key), or None if missing/stale."""
+    with _CACHE_LOCK:
+        row = _cache_db().execute(
+            "SELECT value, ts FROM cache WHERE ns = ? AND key = ?", (ns, key)).fetchone()
+    if row is None or time.time() - row[1] > max_age_s:
+        return None
+    return _json_loads(row[0])
+
+
+def _cache_set(ns, key, value):
+    with _CACHE_LOCK:
+        db = _cache_db()
+        db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                   (ns, key, _json_dumps(value), time.time()))
+        db.commit()
+
+
+# ── Shared HTTP session (OSRM, Overpass, Wikimedia) ─────────────────
+
+HTTP_POOL_SIZE = 20  # photo workers x geosearch radii, plus OSRM fan-out
+
+
+class _PacedRetry(Retry):
+    """urllib3 Retry that caps Retry-After at MAX_RETRY_AFTER_S and, before
+    each retry, waits for the host's rate-limit slot, so retries count
+    against OSRM_RATE / WIKIMEDIA_RATE like first attempts do.
+    """
+
+    def __init__(self, *args, throttle=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.throttle = throttle
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.throttle = self.throttle
+        return retry
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER_S)
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.throttle is not None:
+            self.throttle()
+
+
+@functools.cache
+def _http():
+    """One keep-alive session, so repeat calls to the same API host reuse
+    the TCP/TLS connection instead of handshaking every time. Idempotent
+    requests are retried with backoff on connection errors and 429/5xx.
+    """
+    def adapter(throttle=None):
+        retry = _PacedRetry(total=3, backoff_factor=0.3, status_forcelist=_RETRY_STATUSES,
+                            raise_on_status=False, throttle=throttle)
+        return HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                           max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter())
+    # Rate-limited hosts get their own adapter so retries wait for a slot
+    session.mount("https://router.project-osrm.org/", adapter(_osrm_throttle))
+    session.mount("https://commons.wikimedia.org/", adapter(_wm_throttle))
+    return session
+
+
+def _rate_limiter(rate):
+    """A wait() for one API host: call slots are spaced 1/rate seconds
+    apart, shared by every thread; time already spent waiting on responses
+    counts toward the gap instead of adding to it.
+    """
+    lock = threading.Lock()
+    next_slot = 0.0
+
+    def wait():
+        nonlocal next_slot
+        with lock:
+            now = time.monotonic()
+            delay = next_slot - now
+            next_slot = max(now, next_slot) + 1 / rate
+        if delay > 0:
+            time.sleep(delay)
+
+    return wait
+
 # ── Distance helpers ────────────────────────────────────────────────
 
-def _haversine_km(lat1, lng1, lat2, lng2):
-    """Great-circle distance in km."""
-    R = 6371
-    dlat = math.radians(lat2 - lat1)
-    dlng = math.radians(lng2 - lng1)
-    a = (math.sin(dlat / 2) ** 2 +
-         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-         math.sin(dlng / 2) ** 2)
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+def _unit_xyz(lats, lngs):
+    """Project lat/lng degrees onto unit-sphere Cartesian (x, y, z) rows."""
+    lat_r = np.radians(np.atleast_1d(np.asarray(lats, dtype=float)))
+    lng_r = np.radians(np.atleast_1d(np.asarray(lngs, dtype=float)))
+    cos_lat = np.cos(lat_r)
+    return np.column_stack((cos_lat * np.cos(lng_r), cos_lat * np.sin(lng_r), np.sin(lat_r)))
+
+
+@functools.cache
+def _beach_xyz():
+    """Unit vectors for every OSM beach, row-aligned with _load_beaches()."""
+    lat, lng, _ = _load_beaches()
+    return _unit_xyz(lat, lng)
+
+
+@functools.cache
+def _beach_rad():
+    """(lat, lng, cos(lat)) radian arrays for every OSM beach,
+    row-aligned with _load_beaches().
+    """
+    lat, lng, _ = _load_beaches()
+    lat_r = np.radians(lat)
+    return lat_r, np.radians(lng), np.cos(lat_r)
+
+
+def _haversine_a_vec(lats, lngs, lats_r, lngs_r, cos_lats):
+    """Haversine term `a` from N query points (degrees) to M targets
+    (radians), as an (N, M) matrix. Targets may also be a per-point (N, M)
+    array, e.g. each point's own candidate set. `cos_lats` is the targets'
+    precomputed cos(latitude). `a` is monotone in distance, so rankings can
+    use it directly and convert only the winners with _a_to_km.
+    """
+    lat_r = np.radians(np.asarray(lats, dtype=float))[:, None]
+    lng_r = np.radians(np.asarray(lngs, dtype=float))[:, None]
+    return (np.sin((lats_r - lat_r) / 2) ** 2 +
+            np.cos(lat_r) * cos_lats * np.sin((lngs_r - lng_r) / 2) ** 2)
+
+
+def _a_to_km(a):
+    """Great-circle km for haversine `a` values."""
+    return 6371 * 2 * np.arcsin(np.sqrt(a))
+
+
+def _argmin_rows(a):
+    """Column index and km of each row's minimum in a haversine `a` matrix."""
+    idx = a.argmin(axis=1)
+    return zip(idx.tolist(), _a_to_km(a[np.arange(len(idx)), idx]).tolist())
+
+
+# Static lookup tables as parallel radian arrays for _haversine_a_vec;
+# their latitudes never change, so cos(lat) is computed once here.
+_AIRPORT_CODES = tuple(AIRPORTS)
+_AIRPORT_LAT_R = np.radians([AIRPORTS[c]["lat"] for c in _AIRPORT_CODES])
+_AIRPORT_LNG_R = np.radians([AIRPORTS[c]["lng"] for c in _AIRPORT_CODES])
+_AIRPORT_COS_LAT = np.cos(_AIRPORT_LAT_R)
+_CITY_LAT_R = np.radians([c["lat"] for c in CITIES])
+_CITY_LNG_R = np.radians([c["lng"] for c in CITIES])
+_CITY_COS_LAT = np.cos(_CITY_LAT_R)
+
+
+def nearest_airports(lats, lngs):
+    """nearest_airport for many points at once, as a list of tuples."""
+    out = []
+    for i, km in _argmin_rows(_haversine_a_vec(lats, lngs, _AIRPORT_LAT_R, _AIRPORT_LNG_R,
+                                                  _AIRPORT_COS_LAT)):
+        code = _AIRPORT_CODES[i]
+        info = AIRPORTS[code]
+        # Rough estimate: 1.4x straight-line for roads, 50 km/h average
+        out.append((code, info["name"], int(km * 1.4 / 50 * 60), info["year_round"]))
+    return out
 
 
 def nearest_airport(lat, lng):
     """Return (code, name, drive_min_estimate, year_round)."""
-    best = None
-    best_km = 9999
-    for code, info in AIRPORTS.items():
-        km = _haversine_km(lat, lng, info["lat"], info["lng"])
-        if km < best_km:
-            best_km = km
-            best = (code, info)
-    # Rough estimate: 1.4x straight-line for roads, 50 km/h average
-    drive_min = int(best_km * 1.4 / 50 * 60) if best else 999
-    code, info = best
-    return code, info["name"], drive_min, info["year_round"]
+    return nearest_airports([lat], [lng])[0]
+
+
+_osrm_throttle = _rate_limiter(OSRM_RATE)
 
 
 def _osrm_route(lat1, lng1, lat2, lng2):
-    """Get actual driving distance (km) and duration (min) via OSRM."""
+    """Get actual driving distance (km) and duration (min) via OSRM.
+    Successful routes are cached on disk, so repeat runs skip the request.
+    """
+    key = f"{lat1:.4f},{lng1:.4f};{lat2:.4f},{lng2:.4f}"
+    cached = _cache_get("osrm", key, OSRM_CACHE_MAX_AGE)
+    if cached is not None:
+        return tuple(cached)
     try:
+        _osrm_throttle()  # be polite to the OSRM demo server
         url = (f"https://router.project-osrm.org/route/v1/driving/"
                f"{lng1},{lat1};{lng2},{lat2}?overview=false")
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
+        resp = _http().get(url, timeout=10)
+        data = _json_loads(resp.content)
         if data.get("code") == "Ok" and data.get("routes"):
             route = data["routes"][0]
-            return round(route["distance"] / 1000, 1), max(1, int(route["duration"] / 60))
+            result = round(route["distance"] / 1000, 1), max(1, int(route["duration"] / 60))
+            _cache_set("osrm", key, result)
+            return result
     except Exception:
         pass
     return None, None
 
 
-def nearest_beach(lat, lng):
+BEACH_BATCH_ROWS = 64  # query points per dot-product tile (~3.7 MB float64)
+
+
+def _beach_candidates(lats, lngs, k=5):
+    """Top-k straight-line nearest beaches for each query point.
+    Returns one [(crow_km, name, lat, lng), ...] list per point, nearest first.
+    """
+    beach_lat, beach_lng, beach_name = _load_beaches()
+    if not len(beach_lat):
+        return [[] for _ in lats]
+    xyz = _beach_xyz()
+    beach_lat_r, beach_lng_r, beach_cos_lat = _beach_rad()
+    k = min(k, len(beach_lat))
+    out = []
+    for start in range(0, len(lats), BEACH_BATCH_ROWS):
+        qlat = lats[start:start + BEACH_BATCH_ROWS]
+        qlng = lngs[start:start + BEACH_BATCH_ROWS]
+        # On the unit sphere the largest dot product is the shortest great
+        # circle, so one matrix product ranks every beach for the whole tile.
+        dots = _unit_xyz(qlat, qlng) @ xyz.T
+        idx = np.argpartition(dots, -k, axis=1)[:, -k:]
+        # Exact great-circle km for just the k candidates of each point
+        a = _haversine_a_vec(qlat, qlng, beach_lat_r[idx], beach_lng_r[idx],
+                             beach_cos_lat[idx])
+        order = a.argsort(axis=1)
+        rows = np.arange(len(idx))[:, None]
+        for row_idx, row_km in zip(idx[rows, order].tolist(),
+                                   _a_to_km(a[rows, order]).tolist()):
+            out.append([(d, str(beach_name[i]), float(beach_lat[i]), float(beach_lng[i]))
+                        for i, d in zip(row_idx, row_km)])
+    return out
+
+
+def nearest_beach(lat, lng, top=None):
     """Find nearest real beach from OSM data using actual road distance (OSRM).
+    `top` takes a precomputed _beach_candidates() entry for this point.
     Returns (name, beach_lat, beach_lng, km, drive_min, directions_url).
     """
-    beaches = _load_beaches()
-    if not beaches:
-        url = f"https://www.google.com/maps/search/beach/@{lat},{lng},13z"
-        return "Unknown", lat, lng, 0, 30, url
+    return _beach_with_directions(lat, lng, _nearest_beach_routed(lat, lng, top)[0])
+
 
-    # Step 1: Find top 5 nearest by straight-line (fast pre-filter)
-    candidates = []
-    for b in beaches:
-        km = _haversine_km(lat, lng, b["lat"], b["lng"])
-        candidates.append((km, b))
-    candidates.sort(key=lambda x: x[0])
-    top = candidates[:5]
+def _nearest_beach_routed(lat, lng, top=None):
+    """Beach choice for (lat, lng) as (name, beach_lat, beach_lng, km,
+    drive_min), or None when there is no beach data, plus whether it came
+    from an OSRM route (False means a rough straight-line fallback worth
+    retrying later).
+    """
+    if top is None:
+        top = _beach_candidates([lat], [lng])[0]
+    if not top:
+        return None, False
+
+    # Step 1 (top 5 by straight line) is done in bulk by _beach_candidates.
+
+    # Step 2: Get actual road distance for top candidates via OSRM.
+    # The lookups are independent, so issue them concurrently; cache misses
+    # still go out no faster than OSRM_RATE (see _osrm_route).
+    with ThreadPoolExecutor(max_workers=len(top)) as pool:
+        routes = list(pool.map(lambda c: _osrm_route(lat, lng, c[2], c[3]), top))
 
-    # Step 2: Get actual road distance for top candidates via OSRM
     best = None
     best_road_km = 9999
     best_drive_min = 999
-    for crow_km, b in top:
-        road_km, drive_min = _osrm_route(lat, lng, b["lat"], b["lng"])
+    for cand, (road_km, drive_min) in zip(top, routes):
         if road_km is not None and road_km < best_road_km:
             best_road_km = road_km
             best_drive_min = drive_min
-            best = b
-        time.sleep(0.15)  # Be polite to OSRM demo server
+            best = cand
 
     # Fallback to haversine if OSRM fails
+    routed = best is not None
     if best is None:
-        _, best = top[0]
-        best_road_km = round(top[0][0] * 1.3, 1)  # rough road factor
+        best = top[0]
+        best_road_km = round(best[0] * 1.3, 1)  # rough road factor
         best_drive_min = max(2, int(best_road_km / 40 * 60))
 
-    beach_name = best.get("name", "") or "Beach"
-    blat, blng = best["lat"], best["lng"]
+    _, beach_name, blat, blng = best
+    return (beach_name or "Beach", blat, blng, best_road_km, best_drive_min), routed
 
+
+def _beach_with_directions(lat, lng, choice):
+    """nearest_beach's tuple for a listing at (lat, lng), given a beach
+    choice from _nearest_beach_routed (None when there is no beach data).
+    """
+    if choice is None:
+        url = f"https://www.google.com/maps/search/beach/@{lat},{lng},13z"
+        return "Unknown", lat, lng, 0, 30, url
+    beach_name, blat, blng, road_km, drive_min = choice
     # Google Maps directions link from property to beach
     directions_url = (f"https://www.google.com/maps/dir/{lat},{lng}/"
                       f"{blat},{blng}")
+    return beach_name, blat, blng, road_km, drive_min, directions_url
+
 
-    return beach_name, blat, blng, best_road_km, best_drive_min, directions_url
+def nearest_cities(lats, lngs):
+    """nearest_city for many points at once, as a list of tuples."""
+    out = []
+    for i, km in _argmin_rows(_haversine_a_vec(lats, lngs, _CITY_LAT_R, _CITY_LNG_R,
+                                                  _CITY_COS_LAT)):
+        best = CITIES[i]
+        out.append((best["name"], best["pop"], max(5, int(km * 1.3 / 50 * 60))))
+    return out
 
 
 def nearest_city(lat, lng):
     """Return (city_name, pop, drive_min)."""
-    best = None
-    best_km = 9999
-    for c in CITIES:
-        km = _haversine_km(lat, lng, c["lat"], c["lng"])
-        if km < best_km:
-            best_km = km
-            best = c
-    drive_min = int(best_km * 1.3 / 50 * 60) if best else 999
-    return best["name"], best["pop"], max(5, drive_min)
+    return nearest_cities([lat], [lng])[0]
+
+
+GEO_CELL_DECIMALS = 3  # ~100 m grid; plenty for drive-time estimates
+GEO_CACHE_VERSION = 2  # bump when the cached beach-choice format changes
+_GEO_CACHE = {}  # grid cell -> beach choice, per process
+
+
+def _geo_cell(lat, lng):
+    return round(lat, GEO_CELL_DECIMALS), round(lng, GEO_CELL_DECIMALS)
+
+
+@functools.cache
+def _geo_key_prefix():
+    """On-disk geo cache namespace: format version plus the beach data's
+    row count and file mtime, so refreshing greek_beaches.json retires
+    every cached beach choice without a manual version bump.
+    """
+    mtime = int(os.path.getmtime(_BEACH_JSON)) if os.path.exists(_BEACH_JSON) else 0
+    return f"v{GEO_CACHE_VERSION}:{len(_load_beaches()[0])}@{mtime}"
+
+
+def _nearest_all(points):
+    """(airport, beach, city) results for many (lat, lng) points.
+    Airport and city are cheap and computed for every point. The beach
+    needs OSRM routes, and listings in the same village often share
+    coordinates and stay listed for weeks, so the beach choice is resolved
+    once per grid cell (routed from the first listing seen in it) and kept
+    in memory and in the on-disk cache. Directions links always start from
+    each listing's own coordinates.
+    """
+    if not points:
+        return []
+    cells = [_geo_cell(lat, lng) for lat, lng in points]
+    new = {}  # cell -> first point seen in it
+    for c, pt in zip(cells, points):
+        if c in _GEO_CACHE or c in new:
+            continue
+        cached = _cache_get("geo", f"{_geo_key_prefix()}:{c[0]},{c[1]}", OSRM_CACHE_MAX_AGE)
+        if cached is not None:
+            _GEO_CACHE[c] = tuple(cached)
+        else:
+            new[c] = pt
+    if new:
+        firsts = list(new.values())
+        for cell, (lat, lng), top in zip(new, firsts,
+                                         _beach_candidates([p[0] for p in firsts],
+                                                           [p[1] for p in firsts])):
+            choice, routed = _nearest_beach_routed(lat, lng, top)
+            _GEO_CACHE[cell] = choice
+            if routed:  # don't persist straight-line fallbacks
+                _cache_set("geo", f"{_geo_key_prefix()}:{cell[0]},{cell[1]}", choice)
+
+    lats = [lat for lat, _ in points]
+    lngs = [lng for _, lng in points]
+    return [(airport, _beach_with_directions(lat, lng, _GEO_CACHE[c]), city)
+            for (lat, lng), c, airport, city in zip(points, cells, nearest_airports(lats, lngs),
+                                                    nearest_cities(lats, lngs))]
+
+
+# Address keyword → region, checked in priority order (first hit wins).
+_REGION_KEYWORDS = (
+    ("corfu", "ionian_islands"), ("kerkyra", "ionian_islands"),
+    ("cephalonia", "ionian_islands"), ("kefalonia", "ionian_islands"),
+    ("zakynthos", "ionian_islands"), ("zante", "ionian_islands"),
+    ("lefkada", "ionian_islands"), ("lefkas", "ionian_islands"),
+    ("crete", "crete"), ("chania", "crete"), ("heraklion", "crete"), ("rethymno", "crete"),
+    ("rhodes", "dodecanese"), ("rodos", "dodecanese"), ("kos", "dodecanese"),
+    ("mykonos", "cyclades"), ("santorini", "cyclades"), ("cyclades", "cyclades"),
+    ("thessaloniki", "central_macedonia"), ("halkidiki", "central_macedonia"),
+    ("chalkidiki", "central_macedonia"),
+    ("serres", "northern_greece"), ("drama", "northern_greece"),
+    ("kavala", "northern_greece"), ("thassos", "northern_greece"), ("thrace", "northern_greece"),
+    ("pelion", "pelion_sporades"), ("magnesia", "pelion_sporades"), ("volos", "pelion_sporades"),
+    ("skiathos", "pelion_sporades"), ("skopelos", "pelion_sporades"),
+    ("alonnisos", "pelion_sporades"),
+    ("attica", "attica"), ("athens", "attica"), ("piraeus", "attica"),
+    ("peloponnese", "peloponnese"), ("kalamata", "peloponnese"), ("nafplio", "peloponnese"),
+    ("epirus", "epirus"), ("ioannina", "epirus"), ("preveza", "epirus"),
+)
+# All keywords in one alternation, so the address is scanned once; the rank
+# map lets the highest-priority hit win regardless of its position. The
+# lookahead keeps matches from consuming text, so a keyword overlapping an
+# earlier lower-priority match is still seen.
+_REGION_KW_RE = re.compile("(?=(%s))" % "|".join(re.escape(kw) for kw, _ in _REGION_KEYWORDS))
+_REGION_KW_RANK = {kw: i for i, (kw, _) in enumerate(_REGION_KEYWORDS)}
+
+
+def _keyword_region(display_address):
+    """Region named by the address text, or None."""
+    hits = [_REGION_KW_RANK[m.group(1)] for m in _REGION_KW_RE.finditer(display_address.lower())]
+    return _REGION_KEYWORDS[min(hits)][1] if hits else None
+
+
+_BOX_REGIONS = ("epirus", "northern_greece", "crete", "ionian_islands",
+                "dodecanese", "cyclades", "attica")
+
+
+def _coord_regions(lats, lngs):
+    """Coordinate-box fallback region for each point (first box wins)."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    boxes = [
+        (lats > 40.2) & (lngs < 21.5),
+        (lats > 40.2) & (lngs >= 21.5),
+        lats < 36.0,
+        (lats > 38.5) & (lats < 40.2) & (lngs < 21.0),
+        (lats < 38.5) & (lngs > 27.0),
+        (lats > 36.0) & (lats < 38.0) & (lngs > 24.5) & (lngs < 27.0),
+        (lats > 37.5) & (lats < 38.5) & (lngs > 22.5) & (lngs < 24.5),
+    ]
+    return np.select(boxes, _BOX_REGIONS, default="other").tolist()
 
 
 def classify_region(lat, lng, display_address):
     """Auto-classify into a region based on coordinates & address text."""
-    addr = display_address.lower()
-    lat_f, lng_f = float(lat), float(lng)
-
-    # Island / region detection from address
-    if "corfu" in addr or "kerkyra" in addr:
-        return "ionian_islands"
-    if "cephalonia" in addr or "kefalonia" in addr:
-        return "ionian_islands"
-    if "zakynthos" in addr or "zante" in addr:
-        return "ionian_islands"
-    if "lefkada" in addr or "lefkas" in addr:
-        return "ionian_islands"
-    if "crete" in addr or "chania" in addr or "heraklion" in addr or "rethymno" in addr:
-        return "crete"
-    if "rhodes" in addr or "rodos" in addr:
-        return "dodecanese"
-    if "kos" in addr:
-        return "dodecanese"
-    if "mykonos" in addr or "santorini" in addr or "cyclades" in addr:
-        return "cyclades"
-    if "thessaloniki" in addr or "halkidiki" in addr or "chalkidiki" in addr:
-        return "central_macedonia"
-    if "serres" in addr or "drama" in addr:
-        return "northern_greece"
-    if "kavala" in addr or "thassos" in addr or "thrace" in addr:
-        return "northern_greece"
-    if "pelion" in addr or "magnesia" in addr or "volos" in addr:
-        return "pelion_sporades"
-    if "skiathos" in addr or "skopelos" in addr or "alonnisos" in addr:
-        return "pelion_sporades"
-    if "attica" in addr or "athens" in addr or "piraeus" in addr:
-        return "attica"
-    if "peloponnese" in addr or "kalamata" in addr or "nafplio" in addr:
-        return "peloponnese"
-    if "epirus" in addr or "ioannina" in addr or "preveza" in addr:
-        return "epirus"
-
-    # Coordinate-based fallback
-    if lat_f > 40.2 and lng_f < 21.5:
-        return "epirus"
-    if lat_f > 40.2 and lng_f >= 21.5:
-        return "northern_greece"
-    if lat_f < 36.0:
-        return "crete"
-    if 38.5 < lat_f < 40.2 and lng_f < 21.0:
-        return "ionian_islands"
-    if lat_f < 38.5 and lng_f > 27.0:
-        return "dodecanese"
-    if 36.0 < lat_f < 38.0 and 24.5 < lng_f < 27.0:
-        return "cyclades"
-    if 37.5 < lat_f < 38.5 and 22.5 < lng_f < 24.5:
-        return "attica"
-
-    return "other"
+    return _keyword_region(display_address) or _coord_regions([lat], [lng])[0]
 
 
 # ── GBP to EUR conversion ──────────────────────────────────────────
@@ -294,205 +622,389 @@ GBP_TO_EUR = 1.18  # approximate Feb 2026
 CAD_TO_EUR = 0.68  # approximate Feb 2026
 MAX_EUR = 102000
 MAX_GBP = int(MAX_EUR / GBP_TO_EUR)  # ~86,440
+MAX_DATA_AGE_HOURS = 6  # run_scraper reuses a fresher properties.json
+
+# ── Listing text patterns (compiled once, used per property) ────────
+_PRICE_RE = re.compile(r'\d[\d,]*')
+_AREA_RE = re.compile(r'(\d+)\s*(?:sq\.?\s*m|m²|sqm)', re.I)
+
+
+def _price_int(display_price):
+    """First number in a display price like '€95,000', or None."""
+    m = _PRICE_RE.search(display_price)
+    return int(m.group().replace(",", "")) if m else None
 
 
 # ── Rightmove Overseas Scraper ──────────────────────────────────────
 
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+MAX_RETRY_AFTER_S = 30  # longest Retry-After we'll sit out before retrying
+RIGHTMOVE_CONCURRENCY = 3  # pages in flight at once
+MAX_PAGE_BYTES = 5_000_000  # results pages are ~1 MB; stop reading past this
+# The listings JSON is the only part of the page we need, so match it
+# directly instead of building an HTML tree.
+_NEXT_DATA_RE = re.compile(rb'<script[^>]+id="__NEXT_DATA__"[^>]*>(.+?)</script>', re.S)
+
+
+async def _get_with_retry(session, url, retries=3, backoff=0.4, **kwargs):
+    """GET with exponential backoff on network errors and 429/5xx.
+    Honours a numeric Retry-After header (up to MAX_RETRY_AFTER_S) when
+    the server sends one.
+    """
+    for attempt in range(retries + 1):
+        delay = backoff * 2 ** attempt
+        try:
+            r = await session.get(url, **kwargs)
+        except Exception:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        if r.status_code not in _RETRY_STATUSES or attempt == retries:
+            return r
+        retry_after = r.headers.get("Retry-After", "")
+        await r.aclose()
+        await asyncio.sleep(min(int(retry_after), MAX_RETRY_AFTER_S)
+                            if retry_after.isdigit() else delay)
+
+
+async def _read_capped(chunks):
+    """Join streamed body chunks, or return None once the body grows past
+    MAX_PAGE_BYTES (runaway / non-listing page; don't buffer it all).
+    """
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) > MAX_PAGE_BYTES:
+            return None
+    return bytes(body)
+
+
+def _page_url(page_idx):
+    return (f"https://www.rightmove.co.uk/overseas-property-for-sale/Greece.html"
+            f"?maxPrice={MAX_GBP}&sortType=1&index={page_idx * 24}")
+
+
+async def _fetch_next_data(session, url):
+    """Fetch one results page. Returns (__NEXT_DATA__ bytes or None, skip reason)."""
+    # Headers arrive first: on non-200 we close without reading the body.
+    r = await _get_with_retry(session, url, timeout=20, stream=True)
+    try:
+        if r.status_code != 200:
+            return None, f"HTTP {r.status_code}, skipping"
+        body = await _read_capped(r.aiter_content())
+    finally:
+        await r.aclose()
+    m = _NEXT_DATA_RE.search(body) if body else None
+    if not m:
+        return None, "No __NEXT_DATA__ found (or page over size cap)"
+    return m.group(1), None
+
+
+async def _fetch_all_pages(max_pages):
+    """Fetch every results page concurrently over one session.
+    Results come back in page order; failed pages are exceptions.
+    """
+    sem = asyncio.Semaphore(RIGHTMOVE_CONCURRENCY)
+    async with cffi_req.AsyncSession(impersonate="chrome") as session:
+        async def one(page_idx):
+            async with sem:
+                return await _fetch_next_data(session, _page_url(page_idx))
+        return await asyncio.gather(*(one(i) for i in range(max_pages)),
+                                    return_exceptions=True)
+
+
+@dataclass(slots=True)
+class Property:
+    """One scraped listing. Field order is the key order in properties.json."""
+    title: str
+    price: int
+    area_sqm: int | None
+    bedrooms: int | None
+    bathrooms: int | None
+    url: str
+    image_url: str
+    source: str
+    region: str
+    display_address: str
+    features: list
+    roi: str
+    property_type: str
+    airport_drive_min: int
+    airport_code: str
+    airport_name: str
+    beach_min: int
+    beach_km: float
+    beach_name: str
+    beach_lat: float
+    beach_lng: float
+    beach_directions_url: str
+    nearest_city: str
+    nearest_city_pop: int
+    nearest_city_min: int
+    needs_renovation: bool
+    airbnb_night_rate: int
+    airbnb_occupancy_pct: int
+    lat: float | None
+    lng: float | None
+    rightmove_id: int | str
+    area_photos: list = field(default_factory=list)
+
+
+def _iter_listings(raw_props, seen_ids):
+    """Yield a Property for each new, in-budget listing.
+    The page is filtered first so distances for every located listing come
+    from one batched lookup; Property records are then built lazily.
+    """
+    kept = []
+    for rp in raw_props:
+        pid = rp.get("id")
+        if not pid or pid in seen_ids:
+            continue
+        seen_ids.add(pid)
+
+        # Extract price in EUR
+        price_data = rp.get("price", {})
+        if isinstance(price_data, dict):
+            disp = price_data.get("displayPrices", [{}])
+            gbp_price = None
+            eur_price = None
+            for dp in disp:
+                dstr = dp.get("displayPrice", "")
+                if "€" in dstr:
+                    eur_price = _price_int(dstr) or eur_price
+                elif "£" in dstr:
+                    gbp_price = _price_int(dstr) or gbp_price
+            if not eur_price and gbp_price:
+                eur_price = int(gbp_price * GBP_TO_EUR)
+            elif not eur_price:
+                amt = price_data.get("amount")
+                if amt:
+                    eur_price = int(float(amt) * GBP_TO_EUR)
+        else:
+            eur_price = int(float(price_data) * GBP_TO_EUR) if price_data else None
+
+        if not eur_price or eur_price > MAX_EUR:
+            continue
+
+        # Property sub-type; skip plots / land before doing any other work
+        ptype = rp["propertySubType"] if "propertySubType" in rp else rp.get("propertyType", "Property")
+        if ptype and ptype.lower() in ("plot", "land", "plot of land"):
+            continue
+
+        # Location
+        loc = rp.get("location", {})
+        lat = loc.get("latitude")
+        lng = loc.get("longitude")
+        kept.append((rp, pid, eur_price, ptype,
+                     (float(lat), float(lng)) if lat and lng else (np.nan, np.nan)))
+
+    if not kept:
+        return
+
+    # Fix bad coordinates for the whole page at once (e.g. negative lat for
+    # Greece), then sanity-check: Greece is roughly lat 34-42, lng 19-30.
+    # Missing coordinates are NaN and fail every comparison.
+    coords = np.abs(np.array([c for *_, c in kept]))
+    lats, lngs = coords[:, 0], coords[:, 1]
+    valid = ((lats > 33) & (lats < 43) & (lngs > 18) & (lngs < 31)).tolist()
+    box_regions = _coord_regions(lats, lngs)
+    coords = coords.tolist()
+
+    # Batch the distance lookups for the whole page
+    geo = iter(_nearest_all([c for c, ok in zip(coords, valid) if ok]))
+
+    for (rp, pid, eur_price, ptype, _), (lat, lng), ok, box_region in zip(
+            kept, coords, valid, box_regions):
+        if not ok:
+            lat, lng = None, None
+        display_addr = rp.get("displayAddress", "")
+
+        # Images
+        images = rp.get("images")
+        image_url = images[0].get("srcUrl", "") if images else ""
+
+        bedrooms = rp.get("bedrooms")
+        bathrooms = rp.get("bathrooms")
+
+        # Summary / title
+        summary = rp.get("summary", "")
+        beds_str = f"{bedrooms}-Bed " if bedrooms else ""
+        title = f"{beds_str}{ptype} - {display_addr}" if display_addr else summary[:80]
+
+        # Area in sqm (try to extract from summary)
+        area = None
+        area_match = _AREA_RE.search(summary)
+        if area_match:
+            area = int(area_match.group(1))
+
+        # Build listing URL
+        listing_url = f"https://www.rightmove.co.uk/properties/{pid}#/?channel=OVERSEAS"
+
+        # Compute distances if we have coords
+        airport_code, airport_name, airport_min, airport_yr = "", "", 60, False
+        beach_name, beach_lat, beach_lng, beach_km = "Unknown", 0, 0, 0
+        beach_min_val, beach_directions_url = 30, ""
+        city_name, city_pop, city_min = "", 0, 60
+        region = "other"
+
+        if lat and lng:
+            airport, beach, city = next(geo)
+            airport_code, airport_name, airport_min, airport_yr = airport
+            beach_name, beach_lat, beach_lng, beach_km, beach_min_val, beach_directions_url = beach
+            city_name, city_pop, city_min = city
+            region = _keyword_region(display_addr) or box_region
+
+        # Estimate Airbnb numbers based on region type
+        # Islands/coastal: higher rate, higher occupancy in summer
+        # City: more consistent but moderate
+        airbnb_rate, airbnb_occ = _estimate_airbnb(eur_price, region, bedrooms, beach_min_val, city_min)
+
+        yield Property(
+            title=title[:120],
+            price=eur_price,
+            area_sqm=area,
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+            url=listing_url,
+            image_url=image_url,
+            source="Rightmove",
+            region=region,
+            display_address=display_addr,
+            features=_extract_features(summary, ptype, bedrooms, display_addr),
+            roi="",
+            property_type=ptype or "Property",
+            airport_drive_min=airport_min,
+            airport_code=airport_code,
+            airport_name=airport_name,
+            beach_min=beach_min_val,
+            beach_km=beach_km,
+            beach_name=beach_name,
+            beach_lat=beach_lat,
+            beach_lng=beach_lng,
+            beach_directions_url=beach_directions_url,
+            nearest_city=city_name,
+            nearest_city_pop=city_pop,
+            nearest_city_min=city_min,
+            needs_renovation=_guess_renovation(summary, ptype),
+            airbnb_night_rate=airbnb_rate,
+            airbnb_occupancy_pct=airbnb_occ,
+            lat=lat,
+            lng=lng,
+            rightmove_id=pid,
+        )
+
+
+# Where the listings live in __NEXT_DATA__, most likely first
+_PROPERTIES_PATHS = (
+    ("props", "pageProps", "properties"),
+    ("props", "pageProps", "searchResults", "properties"),
+)
+
+
+def _get_path(d, path):
+    for k in path:
+        d = d[k]
+    return d
+
+
+def _find_path(root, key, max_depth=6):
+    """Key path to the first non-empty list stored under `key`, walking
+    nested dicts depth-first (the order a recursive walk would use).
+    """
+    stack = [(root, ())] if isinstance(root, dict) else []
+    while stack:
+        d, path = stack.pop()
+        v = d.get(key)
+        if isinstance(v, list) and v:
+            return path + (key,)
+        if len(path) < max_depth:
+            stack.extend((v, path + (k,)) for k, v in reversed(d.items())
+                         if isinstance(v, dict))
+    return None
+
+
 def scrape_rightmove_overseas(max_pages=10):
     """
     Live scrape Rightmove Overseas Greece — all regions.
-    Returns list of property dicts with standardised fields.
+    Returns list of Property records with standardised fields.
     """
     properties = []
     seen_ids = set()
+    paths = list(_PROPERTIES_PATHS)
+    pages = asyncio.run(_fetch_all_pages(max_pages))
 
-    for page_idx in range(max_pages):
-        offset = page_idx * 24
-        url = (
-            f"https://www.rightmove.co.uk/overseas-property-for-sale/Greece.html"
-            f"?maxPrice={MAX_GBP}&sortType=1&index={offset}"
-        )
-        print(f"    Page {page_idx + 1}: index={offset}...")
+    for page_idx, page in enumerate(pages):
+        # One write per page keeps progress lines together and cuts syscalls
+        log = [f"    Page {page_idx + 1}: index={page_idx * 24}..."]
         try:
-            r = cffi_req.get(url, impersonate="chrome", timeout=20)
-            if r.status_code != 200:
-                print(f"      HTTP {r.status_code}, skipping")
+            if isinstance(page, BaseException):
+                raise page
+            next_data, skip_reason = page
+            if skip_reason:
+                log.append(f"      {skip_reason}")
                 continue
-
-            soup = BeautifulSoup(r.text, "lxml")
-            script = soup.find("script", id="__NEXT_DATA__")
-            if not script or not script.string:
-                print("      No __NEXT_DATA__ found")
+            # Blocked / empty result pages carry no listings at all; a C-level
+            # substring scan rejects them before decoding and walking the JSON.
+            if b'"properties"' not in next_data:
+                log.append("      No listings in __NEXT_DATA__")
                 continue
 
-            data = json.loads(script.string)
-            page_props = data.get("props", {}).get("pageProps", {})
+            data = _json_loads(next_data)
 
             # Find properties in the nested structure
             raw_props = None
-            for path_fn in [
-                lambda: page_props["properties"],
-                lambda: page_props["searchResults"]["properties"],
-            ]:
+            for path in paths:
                 try:
-                    raw_props = path_fn()
+                    raw_props = _get_path(data, path)
                     break
                 except (KeyError, TypeError):
                     continue
 
             if not raw_props:
-                # Recursive find
-                def _find(d, key, depth=0):
-                    if depth > 6 or not isinstance(d, dict):
-                        return None
-                    if key in d and isinstance(d[key], list) and d[key]:
-                        return d[key]
-                    for v in d.values():
-                        r2 = _find(v, key, depth + 1)
-                        if r2:
-                            return r2
-                    return None
-                raw_props = _find(data, "properties") or []
+                path = _find_path(data, "properties")
+                raw_props = _get_path(data, path) if path else []
+                if path:
+                    paths.insert(0, path)  # later pages share the layout
 
+            # Drop the rest of the page state; only the listings subtree is needed
+            del next_data, data
             page_count = 0
-            for rp in raw_props:
-                pid = rp.get("id")
-                if not pid or pid in seen_ids:
-                    continue
-                seen_ids.add(pid)
-
-                # Extract price in EUR
-                price_data = rp.get("price", {})
-                if isinstance(price_data, dict):
-                    disp = price_data.get("displayPrices", [{}])
-                    gbp_price = None
-                    eur_price = None
-                    for dp in disp:
-                        dstr = dp.get("displayPrice", "")
-                        if "€" in dstr:
-                            m = re.search(r'[\d,]+', dstr.replace(",", ""))
-                            if m:
-                                eur_price = int(m.group())
-                        elif "£" in dstr:
-                            m = re.search(r'[\d,]+', dstr.replace(",", ""))
-                            if m:
-                                gbp_price = int(m.group())
-                    if not eur_price and gbp_price:
-                        eur_price = int(gbp_price * GBP_TO_EUR)
-                    elif not eur_price:
-                        amt = price_data.get("amount")
-                        if amt:
-                            eur_price = int(float(amt) * GBP_TO_EUR)
-                else:
-                    eur_price = int(float(price_data) * GBP_TO_EUR) if price_data else None
-
-                if not eur_price or eur_price > MAX_EUR:
-                    continue
-
-                # Location
-                loc = rp.get("location", {})
-                lat = loc.get("latitude")
-                lng = loc.get("longitude")
-                display_addr = rp.get("displayAddress", "")
-
-                # Fix bad coordinates (e.g. negative lat for Greece)
-                if lat and lng:
-                    lat = abs(float(lat))
-                    lng = abs(float(lng))
-                    # Sanity: Greece is roughly lat 34-42, lng 19-30
-                    if not (33 < lat < 43 and 18 < lng < 31):
-                        lat, lng = None, None
-
-                # Images
-                images = rp.get("images", [])
-                image_url = images[0].get("srcUrl", "") if images else ""
-
-                # Property sub-type
-                ptype = rp.get("propertySubType", rp.get("propertyType", "Property"))
-                bedrooms = rp.get("bedrooms")
-                bathrooms = rp.get("bathrooms")
-
-                # Summary / title
-                summary = rp.get("summary", "")
-                beds_str = f"{bedrooms}-Bed " if bedrooms else ""
-                title = f"{beds_str}{ptype} - {display_addr}" if display_addr else summary[:80]
-
-                # Area in sqm (try to extract from summary)
-                area = None
-                area_match = re.search(r'(\d+)\s*(?:sq\.?\s*m|m²|sqm)', summary, re.I)
-                if area_match:
-                    area = int(area_match.group(1))
-
-                # Skip plots / land only
-                if ptype and ptype.lower() in ("plot", "land", "plot of land"):
-                    continue
-
-                # Build listing URL
-                listing_url = f"https://www.rightmove.co.uk/properties/{pid}#/?channel=OVERSEAS"
-
-                # Compute distances if we have coords
-                airport_code, airport_name, airport_min, airport_yr = "", "", 60, False
-                beach_name, beach_lat, beach_lng, beach_km = "Unknown", 0, 0, 0
-                beach_min_val, beach_directions_url = 30, ""
-                city_name, city_pop, city_min = "", 0, 60
-                region = "other"
-
-                if lat and lng:
-                    airport_code, airport_name, airport_min, airport_yr = nearest_airport(lat, lng)
-                    beach_name, beach_lat, beach_lng, beach_km, beach_min_val, beach_directions_url = nearest_beach(lat, lng)
-                    city_name, city_pop, city_min = nearest_city(lat, lng)
-                    region = classify_region(lat, lng, display_addr)
-
-                # Estimate Airbnb numbers based on region type
-                # Islands/coastal: higher rate, higher occupancy in summer
-                # City: more consistent but moderate
-                airbnb_rate, airbnb_occ = _estimate_airbnb(eur_price, region, bedrooms, beach_min_val, city_min)
-
-                prop = {
-                    "title": title[:120],
-                    "price": eur_price,
-                    "area_sqm": area,
-                    "bedrooms": bedrooms,
-                    "bathrooms": bathrooms,
-                    "url": listing_url,
-                    "image_url": image_url,
-                    "source": "Rightmove",
-                    "region": region,
-                    "display_address": display_addr,
-                    "features": _extract_features(summary, ptype, bedrooms, display_addr),
-                    "roi": "",
-                    "property_type": ptype or "Property",
-                    "airport_drive_min": airport_min,
-                    "airport_code": airport_code,
-                    "airport_name": airport_name,
-                    "beach_min": beach_min_val,
-                    "beach_km": beach_km,
-                    "beach_name": beach_name,
-                    "beach_lat": beach_lat,
-                    "beach_lng": beach_lng,
-                    "beach_directions_url": beach_directions_url,
-                    "nearest_city": city_name,
-                    "nearest_city_pop": city_pop,
-                    "nearest_city_min": city_min,
-                    "needs_renovation": _guess_renovation(summary, ptype),
-                    "airbnb_night_rate": airbnb_rate,
-                    "airbnb_occupancy_pct": airbnb_occ,
-                    "lat": lat,
-                    "lng": lng,
-                    "rightmove_id": pid,
-                }
+            for prop in _iter_listings(raw_props, seen_ids):
                 properties.append(prop)
                 page_count += 1
 
-            print(f"      → {page_count} residential properties (total {len(properties)})")
-            time.sleep(1.5)
+            log.append(f"      → {page_count} residential properties (total {len(properties)})")
 
         except Exception as e:
-            print(f"      Error: {e}")
+            log.append(f"      Error: {e}")
+        finally:
+            sys.stdout.write("\n".join(log) + "\n")
 
     return properties
 
 
+# Summary keyword → feature tag, in display order
+_FEATURE_KEYWORDS = (
+    ("renovated", "Renovated"), ("refurbished", "Refurbished"),
+    ("sea view", "Sea View"), ("mountain view", "Mountain View"),
+    ("garden", "Garden"), ("terrace", "Terrace"), ("balcony", "Balcony"),
+    ("pool", "Pool"), ("parking", "Parking"), ("furnished", "Furnished"),
+    ("stone", "Stone Building"), ("traditional", "Traditional"),
+    ("near beach", "Near Beach"), ("central", "Central Location"),
+)
+
+_RENO_WORDS = ("renovation", "renovate", "needs work", "restore", "ruin",
+               "shell", "unfinished", "project", "to be completed")
+_NO_RENO_WORDS = ("renovated", "newly", "refurbished", "ready to move", "habitable")
+
+# Each keyword list as one alternation, so the text is scanned once. The
+# feature pattern is a lookahead so overlapping keywords are all reported.
+_FEATURE_KW_RE = re.compile("(?=(%s))" % "|".join(re.escape(kw) for kw, _ in _FEATURE_KEYWORDS))
+_RENO_RE = re.compile("|".join(map(re.escape, _RENO_WORDS)))
+_NO_RENO_RE = re.compile("|".join(map(re.escape, _NO_RENO_WORDS)))
+
+
 def _extract_features(summary, ptype, bedrooms, addr):
     """Extract feature tags from listing data."""
     features = []
@@ -501,33 +1013,32 @@ def _extract_features(summary, ptype, bedrooms, addr):
         features.append(f"{bedrooms} bedroom{'s' if bedrooms > 1 else ''}")
     if ptype:
         features.append(ptype)
-    for kw, label in [
-        ("renovated", "Renovated"), ("refurbished", "Refurbished"),
-        ("sea view", "Sea View"), ("mountain view", "Mountain View"),
-        ("garden", "Garden"), ("terrace", "Terrace"), ("balcony", "Balcony"),
-        ("pool", "Pool"), ("parking", "Parking"), ("furnished", "Furnished"),
-        ("stone", "Stone Building"), ("traditional", "Traditional"),
-        ("near beach", "Near Beach"), ("central", "Central Location"),
-    ]:
-        if kw in s:
-            features.append(label)
+    found = {m.group(1) for m in _FEATURE_KW_RE.finditer(s)}
+    if found:
+        features.extend(label for kw, label in _FEATURE_KEYWORDS if kw in found)
     return features[:6]
 
 
 def _guess_renovation(summary, ptype):
     """Guess if property needs renovation from description."""
     s = summary.lower()
-    reno_words = ["renovation", "renovate", "needs work", "restore", "ruin",
-                  "shell", "unfinished", "project", "to be completed"]
-    no_reno = ["renovated", "newly", "refurbished", "ready to move", "habitable"]
-    for w in no_reno:
-        if w in s:
-            return False
-    for w in reno_words:
-        if w in s:
-            return True
-    # Budget properties often need work
-    return False
+    if _NO_RENO_RE.search(s):
+        return False
+    # Budget properties often need work, but only say so when the text does
+    return _RENO_RE.search(s) is not None
+
+
+# Region → (base nightly rate, rate per bedroom, base occupancy %)
+_AIRBNB_BASE = {
+    "cyclades": (55, 20, 50),
+    "dodecanese": (55, 20, 50),
+    "crete": (45, 18, 48),
+    "ionian_islands": (45, 18, 48),
+    "attica": (40, 15, 60),  # year-round city
+    "pelion_sporades": (40, 15, 42),
+    "central_macedonia": (35, 12, 45),
+}
+_AIRBNB_DEFAULT = (30, 12, 35)
 
 
 def _estimate_airbnb(price_eur, region, bedrooms, beach_min, city_min):
@@ -535,24 +1046,8 @@ def _estimate_airbnb(price_eur, region, bedrooms, beach_min, city_min):
     beds = bedrooms or 1
 
     # Base rate by region type
-    if region in ("cyclades", "dodecanese"):
-        base_rate = 55 + beds * 20
-        base_occ = 50
-    elif region in ("crete", "ionian_islands"):
-        base_rate = 45 + beds * 18
-        base_occ = 48
-    elif region in ("attica",):
-        base_rate = 40 + beds * 15
-        base_occ = 60  # year-round city
-    elif region in ("pelion_sporades",):
-        base_rate = 40 + beds * 15
-        base_occ = 42
-    elif region in ("central_macedonia",):
-        base_rate = 35 + beds * 12
-        base_occ = 45
-    else:
-        base_rate = 30 + beds * 12
-        base_occ = 35
+    rate, per_bed, base_occ = _AIRBNB_BASE.get(region, _AIRBNB_DEFAULT)
+    base_rate = rate + beds * per_bed
 
     # Beach proximity bonus
     if beach_min <= 10:
@@ -582,20 +1077,35 @@ _PHOTO_BLACKLIST = re.compile(
 
 _WM_HEADERS = {"User-Agent": "GreekPropertyFinder/1.0"}
 
+PHOTO_RADII_M = (5000, 10000, 20000)  # geosearch radii, most specific first
+PHOTO_WORKERS = 4  # listings whose photos are fetched at once
+PHOTO_CACHE_MAX_AGE = 30 * 86400  # Commons photos of a place rarely change
+WIKIMEDIA_RATE = 5  # requests/second across all photo workers
+_wm_throttle = _rate_limiter(WIKIMEDIA_RATE)
+
+# Title noise stripped before using it as a place-name search hint
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_HINT_NOISE_RE = re.compile(r'\b(city|centre|center|area|island|university)\b', re.I)
+
 
 def _extract_location_hint(title: str) -> str:
     if " - " in title:
         title = title.split(" - ", 1)[1]
-    title = re.sub(r'\([^)]*\)', '', title)
-    title = re.sub(r'\b(city|centre|center|area|island|university)\b', '', title, flags=re.I)
+    # Most titles have no parenthetical; skip the regex when there's no "("
+    if "(" in title:
+        title = _PAREN_RE.sub('', title)
+    title = _HINT_NOISE_RE.sub('', title)
     return title.strip().strip(",").strip()
 
 
 def _wikimedia_geosearch(lat, lng, radius_m=10000, limit=20):
-    """Fetch geotagged photos from Wikimedia Commons near (lat, lng)."""
+    """Fetch geotagged photos from Wikimedia Commons near (lat, lng).
+    Returns None if the request failed (as opposed to found nothing).
+    """
     results = []
     try:
-        resp = requests.get(
+        _wm_throttle()
+        resp = _http().get(
             "https://commons.wikimedia.org/w/api.php",
             params={
                 "action": "query", "generator": "geosearch",
@@ -606,7 +1116,12 @@ def _wikimedia_geosearch(lat, lng, radius_m=10000, limit=20):
             },
             headers=_WM_HEADERS, timeout=12,
         )
-        pages = resp.json().get("query", {}).get("pages", {})
+        if resp.status_code != 200:
+            return None
+        data = _json_loads(resp.content)
+        if "error" in data:  # API errors (ratelimited, maxlag, ...) come as HTTP 200
+            return None
+        pages = data.get("query", {}).get("pages", {})
         for p in pages.values():
             fname = p.get("title", "")
             ii = (p.get("imageinfo") or [{}])[0]
@@ -618,15 +1133,18 @@ def _wikimedia_geosearch(lat, lng, radius_m=10000, limit=20):
                 continue
             results.append(thumb)
     except Exception:
-        pass
+        return None
     return results
 
 
 def _wikimedia_text_search(query, limit=10):
-    """Fallback: text search Wikimedia Commons for a place name."""
+    """Fallback: text search Wikimedia Commons for a place name.
+    Returns None if the request failed (as opposed to found nothing).
+    """
     results = []
     try:
-        resp = requests.get(
+        _wm_throttle()
+        resp = _http().get(
             "https://commons.wikimedia.org/w/api.php",
             params={
                 "action": "query", "generator": "search",
@@ -636,7 +1154,12 @@ def _wikimedia_text_search(query, limit=10):
             },
             headers=_WM_HEADERS, timeout=12,
         )
-        pages = resp.json().get("query", {}).get("pages", {})
+        if resp.status_code != 200:
+            return None
+        data = _json_loads(resp.content)
+        if "error" in data:  # API errors (ratelimited, maxlag, ...) come as HTTP 200
+            return None
+        pages = data.get("query", {}).get("pages", {})
         for p in pages.values():
             fname = p.get("title", "")
             ii = (p.get("imageinfo") or [{}])[0]
@@ -648,7 +1171,7 @@ def _wikimedia_text_search(query, limit=10):
                 continue
             results.append(thumb)
     except Exception:
-        pass
+        return None
     return results
 
 
@@ -662,6 +1185,14 @@ def _satellite_url(lat, lng, zoom=14, w=600, h=400):
     )
 
 
+def _photo_key(lat, lng, title):
+    """Cache / grouping key: ~1 km tile plus the place-name hint, so
+    listings in the same village share one photo lookup.
+    """
+    tile = f"{round(lat, 2)},{round(lng, 2)}" if lat and lng else ""
+    return f"{tile}|{_extract_location_hint(title)}"
+
+
 def fetch_area_photos(lat, lng, title, n=3):
     """
     Get photos of the EXACT area around (lat, lng).
@@ -669,23 +1200,38 @@ def fetch_area_photos(lat, lng, title, n=3):
       1. Wikimedia geotagged photos (taken within 5→10→20 km of the property)
       2. Wikimedia text search for the specific village/town name
       3. Static satellite image of the property location
+    Results are cached on disk per _photo_key unless a request failed.
     """
+    key = _photo_key(lat, lng, title)
+    cached = _cache_get("photos", key, PHOTO_CACHE_MAX_AGE)
+    if cached is not None:
+        return cached[:n]
+
     hint = _extract_location_hint(title)
-    seen = set()
-    results = []
+    # dict keys double as the seen-set and keep first-seen order
+    results = {}
+    failed = False
 
     def _add(urls):
-        for u in urls:
-            if u not in seen:
-                seen.add(u)
-                results.append(u)
+        nonlocal failed
+        if urls is None:
+            failed = True
+        else:
+            results.update(dict.fromkeys(urls))
 
     # ── Step 1: Geotagged photos (progressively wider radius) ────────
+    # The nearest radius usually suffices; only when it falls short are the
+    # wider ones requested, together, and still taken nearest-first.
     if lat and lng:
-        for radius in [5000, 10000, 20000]:
-            _add(_wikimedia_geosearch(lat, lng, radius_m=radius))
-            if len(results) >= n:
-                break
+        nearest, *wider = PHOTO_RADII_M
+        _add(_wikimedia_geosearch(lat, lng, radius_m=nearest))
+        if len(results) < n and wider:
+            with ThreadPoolExecutor(max_workers=len(wider)) as pool:
+                for urls in pool.map(lambda r: _wikimedia_geosearch(lat, lng, radius_m=r),
+                                     wider):
+                    _add(urls)
+                    if len(results) >= n:
+                        break
 
     # ── Step 2: Text search for the exact village/town (last resort) ─
     if len(results) < n:
@@ -707,98 +1253,283 @@ def fetch_area_photos(lat, lng, title, n=3):
     if len(results) < n and lat and lng:
         _add([_satellite_url(lat, lng)])
 
-    return results[:n]
+    photos = list(results)[:n]
+    if not failed:
+        _cache_set("photos", key, photos)
+    return photos
 
 
 # ── Dynamic region info builder ─────────────────────────────────────
 
+REGION_NAMES = {
+    "ionian_islands": "Ionian Islands",
+    "crete": "Crete",
+    "northern_greece": "Northern Greece",
+    "pelion_sporades": "Pelion & Sporades",
+    "attica": "Athens / Attica",
+    "central_macedonia": "Central Macedonia",
+    "dodecanese": "Dodecanese Islands",
+    "cyclades": "Cyclades Islands",
+    "peloponnese": "Peloponnese",
+    "epirus": "Epirus",
+    "other": "Other Regions",
+}
+
+
 def build_region_info(properties):
-    """Build region metadata from the actual scraped properties."""
-    region_data = {}
+    """Build region metadata from the actual scraped properties.
+    Per-region sums come from one numpy bincount per metric.
+    """
+    slot = {}  # region -> bucket index, in first-seen order
+    idx = []
+    airport_codes, city_names = [], []
     for p in properties:
-        r = p.get("region", "other")
-        if r not in region_data:
-            region_data[r] = {
-                "properties": [],
-                "airport_codes": set(),
-                "cities": set(),
-            }
-        region_data[r]["properties"].append(p)
-        if p.get("airport_code"):
-            region_data[r]["airport_codes"].add(p["airport_code"])
-        if p.get("nearest_city"):
-            region_data[r]["cities"].add(p["nearest_city"])
+        i = slot.get(p.region)
+        if i is None:
+            i = slot[p.region] = len(slot)
+            airport_codes.append(set())
+            city_names.append(set())
+        idx.append(i)
+        if p.airport_code:
+            airport_codes[i].add(p.airport_code)
+        if p.nearest_city:
+            city_names[i].add(p.nearest_city)
+
+    idx = np.asarray(idx, dtype=np.intp)
+    n = len(slot)
+
+    def _column(attr):
+        return np.fromiter(map(attrgetter(attr), properties), dtype=float, count=len(idx))
+
+    def _sums(weights):
+        return np.bincount(idx, weights=weights, minlength=n).tolist()
+
+    counts = np.bincount(idx, minlength=n).tolist()
+    price = _column("price")
+    price_sums = _sums(price)
+    airport_sums = _sums(_column("airport_drive_min"))
+    beach_sums = _sums(_column("beach_min"))
+
+    # Estimate rental yield (annual Airbnb income / price) where price > 0
+    priced = price > 0
+    annual = _column("airbnb_night_rate") * 365 * (_column("airbnb_occupancy_pct") / 100)
+    yields = np.divide(annual, price, out=np.zeros_like(price), where=priced) * 100
+    yield_sums = _sums(yields)
+    yield_counts = _sums(priced)
 
     regions = {}
-    region_names = {
-        "ionian_islands": "Ionian Islands",
-        "crete": "Crete",
-        "northern_greece": "Northern Greece",
-        "pelion_sporades": "Pelion & Sporades",
-        "attica": "Athens / Attica",
-        "central_macedonia": "Central Macedonia",
-        "dodecanese": "Dodecanese Islands",
-        "cyclades": "Cyclades Islands",
-        "peloponnese": "Peloponnese",
-        "epirus": "Epirus",
-        "other": "Other Regions",
-    }
-
-    for r, info in region_data.items():
-        props = info["properties"]
-        codes = sorted(info["airport_codes"])
-        cities = sorted(info["cities"])
-        avg_price = int(sum(p["price"] for p in props) / len(props)) if props else 0
-        avg_airport = int(sum(p.get("airport_drive_min", 60) for p in props) / len(props))
-        avg_beach = int(sum(p.get("beach_min", 30) for p in props) / len(props))
-
-        # Estimate rental yield
-        yields = []
-        for p in props:
-            rate = p.get("airbnb_night_rate", 50)
-            occ = p.get("airbnb_occupancy_pct", 40) / 100
-            annual = rate * 365 * occ
-            if p["price"] > 0:
-                yields.append(annual / p["price"] * 100)
-        avg_yield = sum(yields) / len(yields) if yields else 4.5
+    for r, i in slot.items():
+        count = counts[i]
+        codes = sorted(airport_codes[i])
+        cities = sorted(city_names[i])
+        avg_price = int(price_sums[i] / count)
+        avg_airport = int(airport_sums[i] / count)
+        avg_beach = int(beach_sums[i] / count)
+        avg_yield = yield_sums[i] / yield_counts[i] if yield_counts[i] else 4.5
+        name = REGION_NAMES.get(r) or r.replace("_", " ").title()
+        code_str = " / ".join(codes)
 
         regions[r] = {
-            "name": region_names.get(r, r.replace("_", " ").title()),
+            "name": name,
             "city_pop": ", ".join(cities[:3]),
-            "airport": " / ".join(codes) if codes else "Nearest varies",
-            "airport_code": " / ".join(codes),
+            "airport": code_str or "Nearest varies",
+            "airport_code": code_str,
             "airport_drive_min": avg_airport,
             "airport_note": f"Average {avg_airport} min drive to nearest airport",
             "airport_international": True,
             "airport_seasonal": r not in ("attica", "northern_greece"),
             "beach_distance": f"Average {avg_beach} min to nearest beach",
             "beach_distance_min": avg_beach,
-            "description": f"{len(props)} properties found in {region_names.get(r, r)}.",
+            "description": f"{count} properties found in {name}.",
             "avg_price_sqm": int(avg_price / 60),  # rough estimate
             "rental_yield": f"{avg_yield:.0f}-{avg_yield+1:.0f}%",
             "rental_yield_mid": round(avg_yield, 1),
-            "why_invest": f"{len(props)} budget properties available.",
+            "why_invest": f"{count} budget properties available.",
         }
 
     return regions
 
 
+# ── Static output metadata (identical on every run) ─────────────────
+# Read-only, so every run (and every caller) shares the same objects
+SOURCES = ("Rightmove Overseas (rightmove.co.uk)",)
+
+SOURCE_NOTE = ("Rightmove aggregates listings from Greek real estate agencies. "
+               "Spitogatos.gr, xe.gr, and tospitimou.gr block automated scraping. "
+               "Many local agency listings also appear on Rightmove Overseas.")
+
+MARKET_CONTEXT = MappingProxyType({
+    "avg_annual_appreciation": "7-9% (2024-2025)",
+    "mortgage_rate": "3.5% (variable, as of Oct 2025)",
+    "transfer_tax": "3.09% of property value",
+    "notary_fees": "0.65-1% of property value",
+    "legal_fees": "1-2% of property value",
+    "total_buying_costs": "~8-10% on top of purchase price",
+    "budget": "150,000 CAD ≈ €102,000 EUR (Feb 2026 rate)",
+    "budget_note": "Searching all of Greece for properties near beaches and civilization.",
+    "golden_visa_threshold": "€250,000 (higher in prime areas)",
+    "eu_citizen_note": "As an Estonian passport holder, you are an EU citizen. "
+                      "No restrictions on buying property in Greece.",
+    "canadian_note": "Canadian citizenship provides banking flexibility. "
+                    "With Estonian (EU) passport, full rights to live, work, "
+                    "and own property anywhere in the EU.",
+    "rental_income_tax": "15% on first €12,000/year, 35% on €12,001-€35,000",
+    "property_tax_annual": "ENFIA tax: €2-13 per sqm depending on location",
+})
+
+# Trailing, run-independent part of properties.json
+_OUTPUT_STATIC = MappingProxyType({
+    "sources": SOURCES,
+    "source_note": SOURCE_NOTE,
+    "market_context": MARKET_CONTEXT,
+})
+
+
+def _json_default(o):
+    """Encoder hook: datetimes and Property records (stdlib json only;
+    orjson handles those natively) and read-only mappings (both).
+    """
+    if isinstance(o, MappingProxyType):
+        return dict(o)
+    if isinstance(o, datetime):
+        return o.isoformat()
+    if is_dataclass(o):
+        return asdict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _dumps(obj, indent=True):
+    """obj as UTF-8 JSON bytes (orjson when available), 2-space indented
+    or compact. datetimes and Property records encode the same either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False,
+                      default=_json_default).encode()
+
+
+@functools.cache
+def _static_fragment(key):
+    """_write_output's encoding of one _OUTPUT_STATIC value, built once."""
+    return _dumps(_OUTPUT_STATIC[key]).replace(b"\n", b"\n  ")
+
+
+@contextlib.contextmanager
+def _atomic_open(path):
+    """Binary handle on a temp sibling of path, fsynced and renamed into
+    place on success, so readers never see a truncated or half-written file.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _write_output(path, output, ndjson_path=None):
+    """Write the output dict as indented JSON, byte-for-byte what one
+    dump would give, but encoding "properties" a record at a time so the
+    document never sits in memory as a single encoded buffer. With
+    ndjson_path the records also go there, one compact object per line.
+    """
+    with contextlib.ExitStack() as stack:
+        f = stack.enter_context(_atomic_open(path))
+        nd = stack.enter_context(_atomic_open(ndjson_path)) if ndjson_path else None
+        for i, (key, value) in enumerate(output.items()):
+            f.write(b",\n  " if i else b"{\n  ")
+            f.write(_dumps(key) + b": ")
+            if key in _OUTPUT_STATIC and value is _OUTPUT_STATIC[key]:
+                f.write(_static_fragment(key))
+                continue
+            if key != "properties" or not value:
+                f.write(_dumps(value).replace(b"\n", b"\n  "))
+                continue
+            for j, p in enumerate(value):
+                f.write(b",\n    " if j else b"[\n    ")
+                f.write(_dumps(p).replace(b"\n", b"\n    "))
+                if nd is not None:
+                    nd.write(_dumps(p, indent=False) + b"\n")
+            f.write(b"\n  ]")
+        f.write(b"\n}" if output else b"{}")
+
+
+def _load_output(path):
+    """Read a saved properties.json back into the shape run_scraper
+    returns (datetime scraped_date, Property records, static sections as
+    built in _OUTPUT_STATIC), or None if it doesn't fit that shape.
+    """
+    try:
+        with open(path, "rb") as f:
+            output = _json_loads(f.read())
+        output["scraped_date"] = datetime.fromisoformat(output["scraped_date"])
+        output["properties"] = [Property(**p) for p in output["properties"]]
+    except Exception:
+        return None
+    if "sources" in output:
+        output["sources"] = tuple(output["sources"])
+    if "market_context" in output:
+        output["market_context"] = MappingProxyType(output["market_context"])
+    return output
+
+
+def _write_ndjson(path, properties):
+    """Write records one compact JSON object per line, as _write_output does."""
+    with _atomic_open(path) as f:
+        for p in properties:
+            f.write(_dumps(p, indent=False) + b"\n")
+
+
+def _write_gzip_copy(path, gz_path):
+    """Gzip a finished output file for shipping; level 1 is plenty for
+    JSON this repetitive. The header names the source file (not the temp
+    file being written) and mtime=0 keeps the bytes stable across runs.
+    """
+    with open(path, "rb") as src, _atomic_open(gz_path) as raw:
+        with gzip.GzipFile(filename=os.path.basename(path), fileobj=raw, mode="wb",
+                           compresslevel=1, mtime=0) as gz:
+            shutil.copyfileobj(src, gz, 1 << 20)
+
+
 # ── Main scraper ────────────────────────────────────────────────────
 
-def run_scraper():
-    """Main scraper function."""
+def run_scraper(force=False, gzip_output=False):
+    """Main scraper function.
+    Reuses data/properties.json if it was scraped less than
+    MAX_DATA_AGE_HOURS ago, unless force is set. gzip_output also writes
+    data/properties.json.gz.
+    """
     print("=" * 60)
     print("Greek Property Finder - Web Scraper")
     print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print("=" * 60)
 
-    all_properties = []
+    out_path = os.path.join("data", "properties.json")
+    ndjson_path = os.path.join("data", "properties.ndjson")
+    # Age comes from the scraped_date inside the file: the file is tracked
+    # in git, so its mtime only says when it was last checked out
+    saved = None if force or not os.path.exists(out_path) else _load_output(out_path)
+    if saved is not None:
+        age_h = (datetime.now() - saved["scraped_date"]).total_seconds() / 3600
+        if age_h < MAX_DATA_AGE_HOURS:
+            print(f"\n{out_path} was scraped {age_h:.1f}h ago — reusing it "
+                  f"(pass --force to re-scrape)")
+            if not os.path.exists(ndjson_path):
+                _write_ndjson(ndjson_path, saved["properties"])
+            if gzip_output:
+                _write_gzip_copy(out_path, out_path + ".gz")
+            return saved
+
+    sources = []  # one list of Property records per portal
 
     # 1. Live scrape Rightmove Overseas Greece
     print("\n[1/2] Live scraping Rightmove Overseas Greece...")
     try:
         rightmove = scrape_rightmove_overseas(max_pages=12)
-        all_properties.extend(rightmove)
+        sources.append(rightmove)
         print(f"  → Got {len(rightmove)} properties from Rightmove")
     except Exception as e:
         print(f"  → Rightmove scrape failed: {e}")
@@ -808,27 +1539,19 @@ def run_scraper():
     print("\n  Note: Spitogatos/xe.gr/tospitimou block automated scraping.")
     print("  Rightmove aggregates from Greek agencies — this covers the market.")
 
-    # Deduplicate by rightmove_id or title
-    seen = set()
-    unique = []
-    for p in all_properties:
-        key = p.get("rightmove_id") or p.get("title", "")
-        if key not in seen:
-            seen.add(key)
-            unique.append(p)
-    all_properties = unique
-
-    # Filter: budget + actual buildings (not plots)
-    investment_properties = [
-        p for p in all_properties
-        if p.get("price") and p["price"] <= MAX_EUR
-        and p.get("lat") and p.get("lng")
-    ]
+    # Deduplicate by rightmove_id or title (dict keeps first-seen order)
+    unique = {}
+    for p in chain.from_iterable(sources):
+        unique.setdefault(p.rightmove_id or p.title, p)
 
-    # Sort by price
-    investment_properties.sort(key=lambda p: p["price"])
+    # Filter (budget + actual buildings with coords) and sort by price in
+    # one pass; sorted() builds the only intermediate list
+    investment_properties = sorted(
+        (p for p in unique.values() if p.price and p.price <= MAX_EUR and p.lat and p.lng),
+        key=attrgetter("price"),
+    )
 
-    print(f"\nTotal scraped: {len(all_properties)}")
+    print(f"\nTotal scraped: {len(unique)}")
     print(f"Budget residential with coords: {len(investment_properties)}")
 
     # Build dynamic region info
@@ -837,61 +1560,52 @@ def run_scraper():
 
     # 2. Fetch area photos
     print(f"\n[2/2] Fetching area photos from Wikimedia Commons...")
-    for i, p in enumerate(investment_properties):
-        lat = p.get("lat")
-        lng = p.get("lng")
-        title = p.get("title", "")
-        if lat and lng:
-            photos = fetch_area_photos(lat, lng, title)
-            p["area_photos"] = photos
+
+    # Listings in the same village share one lookup
+    groups = {}
+    for p in investment_properties:
+        groups.setdefault(_photo_key(p.lat, p.lng, p.title), []).append(p)
+
+    def _photos(group):
+        first = group[0]
+        return fetch_area_photos(first.lat, first.lng, first.title)
+
+    # Groups are independent, so several are fetched at once; map()
+    # still yields them in order, keeping the progress log sorted.
+    with ThreadPoolExecutor(max_workers=PHOTO_WORKERS) as pool:
+        for i, (group, photos) in enumerate(zip(groups.values(), pool.map(_photos, groups.values()))):
+            for p in group:
+                p.area_photos = list(photos)
             status = f"{len(photos)} photos" if photos else "none"
-            print(f"  [{i+1}/{len(investment_properties)}] {title[:50]:50s} → {status}")
-            time.sleep(0.4)
-        else:
-            p["area_photos"] = []
+            shared = f" (x{len(group)})" if len(group) > 1 else ""
+            print(f"  [{i+1}/{len(groups)}] {group[0].title[:50]:50s} → {status}{shared}")
 
     # Save
     output = {
-        "scraped_date": datetime.now().isoformat(),
+        "scraped_date": datetime.now(),
         "total_properties": len(investment_properties),
         "regions": regions,
         "properties": investment_properties,
-        "sources": ["Rightmove Overseas (rightmove.co.uk)"],
-        "source_note": "Rightmove aggregates listings from Greek real estate agencies. "
-                       "Spitogatos.gr, xe.gr, and tospitimou.gr block automated scraping. "
-                       "Many local agency listings also appear on Rightmove Overseas.",
-        "market_context": {
-            "avg_annual_appreciation": "7-9% (2024-2025)",
-            "mortgage_rate": "3.5% (variable, as of Oct 2025)",
-            "transfer_tax": "3.09% of property value",
-            "notary_fees": "0.65-1% of property value",
-            "legal_fees": "1-2% of property value",
-            "total_buying_costs": "~8-10% on top of purchase price",
-            "budget": "150,000 CAD ≈ €102,000 EUR (Feb 2026 rate)",
-            "budget_note": "Searching all of Greece for properties near beaches and civilization.",
-            "golden_visa_threshold": "€250,000 (higher in prime areas)",
-            "eu_citizen_note": "As an Estonian passport holder, you are an EU citizen. "
-                              "No restrictions on buying property in Greece.",
-            "canadian_note": "Canadian citizenship provides banking flexibility. "
-                            "With Estonian (EU) passport, full rights to live, work, "
-                            "and own property anywhere in the EU.",
-            "rental_income_tax": "15% on first €12,000/year, 35% on €12,001-€35,000",
-            "property_tax_annual": "ENFIA tax: €2-13 per sqm depending on location",
-        }
+        **_OUTPUT_STATIC,
     }
 
     os.makedirs("data", exist_ok=True)
-    with open("data/properties.json", "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    _write_output(out_path, output, ndjson_path)
+    if gzip_output:
+        _write_gzip_copy(out_path, out_path + ".gz")
 
     print(f"\nData saved to data/properties.json")
-    print(f"Properties by region:")
-    for r, info in sorted(regions.items(), key=lambda x: -len(x[1].get("city_pop", ""))):
-        count = len([p for p in investment_properties if p.get("region") == r])
-        print(f"  {regions[r]['name']:30s} — {count} properties")
+    region_counts = Counter(p.region for p in investment_properties)
+    # Longest city list first; the index keeps ties in insertion order and
+    # means the info dicts themselves are never compared
+    ranked = sorted((-len(info.get("city_pop", "")), i, r, info)
+                    for i, (r, info) in enumerate(regions.items()))
+    # One write for the whole table rather than a print per region
+    print("\n".join(["Properties by region:"] + [
+        f"  {info['name']:30s} — {region_counts[r]} properties" for _, _, r, info in ranked]))
 
     return output
 
 
 if __name__ == "__main__":
-    run_scraper()
+    run_scraper(force="--force" in sys.argv[1:], gzip_output="--gzip" in sys.argv[1:])